@@ -1,11 +1,13 @@
 """The GL-inet integration."""
 from __future__ import annotations
 
+import asyncio
+
 from homeassistant.components.device_tracker import CONF_CONSIDER_HOME
 from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntry
 from homeassistant.core import HomeAssistant
 
-from .const import DATA_GLINET, DOMAIN
+from .const import DOMAIN
 from .router import GLinetRouter
 
 PLATFORMS = ["device_tracker","switch"] #TODO add other services such as sensor.py
@@ -22,7 +24,7 @@ async def async_setup(hass: HomeAssistant, config: ConfigEntry):
     for name, value in conf.items():
         if name in ([CONF_CONSIDER_HOME]):
             options[name] = value
-    hass.data[DOMAIN]["yaml_options"] = options
+    hass.data.setdefault(DOMAIN, {})["yaml_options"] = options
 
     # check if already configured
     domains_list = hass.config_entries.async_domains()
@@ -51,27 +53,31 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Store an API object for your platforms to access
     router = GLinetRouter(hass, entry)
     await router.setup()
-    #router.async_on_close(entry.add_update_listener(update_listener))
-    hass.data[DOMAIN] = {}
-    hass.data[DOMAIN][entry.entry_id] = {}
-    hass.data[DOMAIN][entry.entry_id][DATA_GLINET] = router
-
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.runtime_data = router
+    entry.async_on_unload(entry.add_update_listener(update_listener))
+
+    # Which entities exist depends on the configuration, so it is fetched first,
+    # failing setup here rather than inside the task group
+    await router.async_config_first_refresh()
+
+    # Platforms that need the first poll's data wait for it themselves
+    async with asyncio.TaskGroup() as tg:
+        tg.create_task(router.async_first_refresh())
+        tg.create_task(
+            hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+        )
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
-    if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
-
-    return unload_ok
+    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
 async def update_listener(hass: HomeAssistant, entry: ConfigEntry):
     """Update when config_entry options update."""
-    router: GLinetRouter = hass.data[DOMAIN][entry.entry_id][DATA_GLINET]
+    router: GLinetRouter = entry.runtime_data
 
-    if router.update_options(entry.options): #TODO does this ever return True?
+    # Options are applied in place, so this only reloads if that ever stops being enough
+    if router.update_options(entry.options):
         await hass.config_entries.async_reload(entry.entry_id)
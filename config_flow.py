@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+from functools import lru_cache
 import logging
 from typing import Any
 
@@ -13,7 +15,14 @@ from homeassistant.components.device_tracker import (
     CONF_CONSIDER_HOME,
     DEFAULT_CONSIDER_HOME,
 )
-from homeassistant.const import CONF_API_TOKEN, CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.const import (
+    CONF_API_TOKEN,
+    CONF_HOST,
+    CONF_MAC,
+    CONF_MODEL,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+)
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
@@ -32,32 +41,60 @@ from .const import (
 
 _LOGGER = logging.getLogger(__name__)
 
-STEP_USER_DATA_SCHEMA = vol.Schema(
-    {
-        vol.Required(CONF_USERNAME, default=GLINET_DEFAULT_USERNAME): str,
-        vol.Required(CONF_HOST, default=GLINET_DEFAULT_URL): str,
-        vol.Required(CONF_PASSWORD, default=GLINET_DEFAULT_PW): str,
-    }
-)
+
+@lru_cache(maxsize=8)
+def _user_data_schema(username: str, host: str) -> vol.Schema:
+    """Return the user step schema prefilled with a username and host.
+
+    Used to re-show the form after an error without building a new schema
+    on every attempt. The password is never prefilled with user input.
+    """
+    return vol.Schema(
+        {
+            vol.Required(CONF_USERNAME, default=username): str,
+            vol.Required(CONF_HOST, default=host): str,
+            vol.Required(CONF_PASSWORD, default=GLINET_DEFAULT_PW): str,
+        }
+    )
+
+
+STEP_USER_DATA_SCHEMA = _user_data_schema(GLINET_DEFAULT_USERNAME, GLINET_DEFAULT_URL)
+
+
+@lru_cache(maxsize=16)
+def _options_schema(consider_home: int) -> vol.Schema:
+    """Return the options schema for a given consider_home default.
+
+    The schema only varies with the default, so it is built once per value.
+    """
+    return vol.Schema(
+        {
+            vol.Optional(CONF_CONSIDER_HOME, default=consider_home): vol.All(
+                vol.Coerce(int), vol.Clamp(min=0, max=900)
+            )
+        }
+    )
 
 
 class TestingHub:
     """Testing class to test connection and authentication."""
 
+    __slots__ = ("host", "username", "router", "_info_cache", "formatted_mac")
+
     def __init__(self, username: str, host: str) -> None:
         """Initialize."""
         self.host: str = host
         self.username: str = username
         self.router: GLinet = GLinet(base_url=self.host + API_PATH)
-        self.router_mac: str = ""
-        self.router_model: str = ""
+        self._info_cache: dict | None = None
+        self.formatted_mac: str = ""
 
     async def connect(self) -> bool:
         """Test if we can communicate with the host."""
         try:
             res = await self.router.router_reachable(self.username)
             # TODO, on success we can/should probably store some immutable device info in the class.
-            _LOGGER.warning("Attempting to connect to router, success:%s", res)
+            _LOGGER.debug("Attempting to connect to router, success:%s", res)
             return res
         except ConnectionError:
             _LOGGER.error(
@@ -74,19 +111,33 @@ class TestingHub:
         """Test if we can authenticate with the host."""
         try:
             await self.router.login(self.username, password)
-            res = await self.router.router_info()
-            self.router_mac = res["mac"]
-            self.router_model = res["model"]
-            # TODO, on success we can/should probably store some immutable device info in the class.
+            # connect() may run concurrently, so only go further once logged in
+            if self.router.logged_in and self._info_cache is None:
+                # mac and model never change, so only ask the router once per hub
+                self._info_cache = await self.router.router_info()
+                self.formatted_mac = format_mac(self.router_mac)
         except ConnectionRefusedError:
             _LOGGER.error("Failed to authenticate with Gl-inet router during testing")
         return self.router.logged_in
 
+    @property
+    def router_mac(self) -> str:
+        """Return the router mac, empty until authenticated."""
+        return (self._info_cache or {}).get("mac", "")
 
-async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
+    @property
+    def router_model(self) -> str:
+        """Return the router model, empty until authenticated."""
+        return (self._info_cache or {}).get("model", "")
+
+
+async def validate_input(
+    hass: HomeAssistant, data: dict[str, Any], hub: TestingHub | None = None
+) -> dict[str, Any]:
     """Validate the user input allows us to connect.
 
     Data has the keys from STEP_USER_DATA_SCHEMA with values provided by the user.
+    An existing hub for the same host and username can be passed in to be reused.
     """
 
     # If your PyPI package is not built with async, pass your methods
@@ -95,25 +146,33 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     #     your_validate_func, data["username"], data["password"]
     # )
 
-    hub = TestingHub(data[CONF_USERNAME], data[CONF_HOST])
+    if hub is None:
+        hub = TestingHub(data[CONF_USERNAME], data[CONF_HOST])
+
+    # The reachability probe and the login hit independent endpoints
+    reachable, authenticated = await asyncio.gather(
+        hub.connect(), hub.authenticate(data[CONF_PASSWORD]), return_exceptions=True
+    )
 
-    if not await hub.connect():
+    if isinstance(reachable, BaseException) or not reachable:
         raise CannotConnect
 
-    if not await hub.authenticate(data[CONF_PASSWORD]):
+    if isinstance(authenticated, BaseException) or not authenticated:
         raise InvalidAuth
 
     # Return info that you want to store in the config entry.
     return {
         # TODO, on success we can/should probably store some immutable device info in the class.
         # TODO should we be using inbuilt literals and consts here?
-        "title": "GL-inet " + hub.router_model.capitalize(),
-        "mac": hub.router_mac,
+        "title": f"GL-inet {hub.router_model.capitalize()}",
+        "mac": hub.formatted_mac,
         "data": {
             CONF_USERNAME: data[CONF_USERNAME],
             CONF_HOST: data[CONF_HOST],
             CONF_API_TOKEN: hub.router.sid,
             CONF_PASSWORD: data[CONF_PASSWORD],
+            CONF_MAC: hub.router_mac,
+            CONF_MODEL: hub.router_model,
         },
     }
 
@@ -123,6 +182,10 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize the config flow."""
+        self._hub: TestingHub | None = None
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -135,8 +198,14 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             )
 
         errors = {}
+        if (
+            self._hub is None
+            or self._hub.host != user_input[CONF_HOST]
+            or self._hub.username != user_input[CONF_USERNAME]
+        ):
+            self._hub = TestingHub(user_input[CONF_USERNAME], user_input[CONF_HOST])
         try:
-            info = await validate_input(self.hass, user_input)
+            info = await validate_input(self.hass, user_input, self._hub)
             # TODO would it be sensible to do some checks here, e.g of API version and issue warnings for possibly unsupported versions?
         except CannotConnect:
             errors["base"] = "cannot_connect"
@@ -146,13 +215,16 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             _LOGGER.exception("Unexpected exception")
             errors["base"] = "unknown"
         else:
-            unique_id: str = format_mac(info["mac"])
-            await self.async_set_unique_id(unique_id)
+            await self.async_set_unique_id(info["mac"])
             self._abort_if_unique_id_configured()
             return self.async_create_entry(title=info["title"], data=info["data"])
 
         return self.async_show_form(
-            step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
+            step_id="user",
+            data_schema=_user_data_schema(
+                user_input[CONF_USERNAME], user_input[CONF_HOST]
+            ),
+            errors=errors,
         )
 
     @staticmethod
@@ -174,15 +246,12 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
         if user_input is not None:
             return self.async_create_entry(title="", data=user_input)
         # TODO add options to reconfigure host name and password
-        data_schema = vol.Schema(
-            {
-                vol.Optional(
-                    CONF_CONSIDER_HOME,
-                    default=self.config_entry.options.get(
-                        CONF_CONSIDER_HOME, DEFAULT_CONSIDER_HOME.total_seconds()
-                    ),
-                ): vol.All(vol.Coerce(int), vol.Clamp(min=0, max=900))
-            }
+        data_schema = _options_schema(
+            int(
+                self.config_entry.options.get(
+                    CONF_CONSIDER_HOME, DEFAULT_CONSIDER_HOME.total_seconds()
+                )
+            )
         )
         return self.async_show_form(step_id="init", data_schema=data_schema)
 
@@ -1,7 +1,6 @@
 """Constants for the GL-inet integration."""
 
 DOMAIN = "glinet"
-DATA_GLINET = "glinet"
 API_PATH = "/rpc"
 GLINET_DEFAULT_URL = "http://192.168.8.1"
 GLINET_DEFAULT_PW = "goodlife"
@@ -13,7 +13,7 @@ from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import DeviceInfo
 
-from .const import DATA_GLINET, DOMAIN
+from .const import DOMAIN
 from .router import ClientDevInfo, GLinetRouter
 
 DEFAULT_DEVICE_NAME = "Unknown device"
@@ -23,19 +23,27 @@ async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities
 ) -> None:
     """Set up device tracker for GLinet component."""
-    router: GLinetRouter = hass.data[DOMAIN][entry.entry_id][DATA_GLINET]
+    router: GLinetRouter = entry.runtime_data
     tracked: set[str] = set()
 
     @callback
-    def update_router():
-        """Update the values of the router."""
-        add_entities(router, async_add_entities, tracked)
+    def add_new_devices(devices: list[ClientDevInfo]) -> None:
+        """Add the batch of devices found by a poll of the router."""
+        new_devices = [device for device in devices if device.mac not in tracked]
+        if not new_devices:
+            return
 
-    # router.async_on_close(
-    #    async_dispatcher_connect(hass, router.signal_device_new, update_router)
-    # )
+        tracked.update(device.mac for device in new_devices)
+        async_add_entities([GLinetDevice(router, device) for device in new_devices])
 
-    update_router()
+    # Devices found by the router's polls arrive here
+    entry.async_on_unload(
+        async_dispatcher_connect(hass, router.signal_device_new, add_new_devices)
+    )
+
+    # Restored devices are only known to be home once the router has been polled
+    await router.async_wait_first_refresh()
+    add_entities(router, async_add_entities, tracked)
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -44,40 +52,31 @@ _LOGGER = logging.getLogger(__name__)
 @callback
 def add_entities(router: GLinetRouter, async_add_entities, tracked):
     """Add new tracker entities from the router."""
-    new_tracked = []
-    for mac, device in router.devices.items():
-        if mac in tracked:
-            continue
-
-        new_tracked.append(GLinetDevice(router, device))
-        tracked.add(mac)
+    new_macs = router.devices.keys() - tracked
+    if not new_macs:
+        return
 
-    if new_tracked:
-        async_add_entities(new_tracked)
+    tracked |= new_macs
+    async_add_entities(
+        [GLinetDevice(router, router.devices[mac]) for mac in new_macs]
+    )
 
 
 class GLinetDevice(ScannerEntity):
     """Representation of a GLinet tracked device."""
 
+    # TODO will need to be replaced with brand logo or similar
+    # TODO theoretically HA should give the default device tracker icon
+    _attr_icon = "mdi:radar"
+    _attr_should_poll = False
+
     def __init__(self, router: GLinetRouter, device: ClientDevInfo) -> None:
         """Initialize a GLinet device."""
         self._router: GLinetRouter = router
         self._device: ClientDevInfo = device
-        self._icon = (
-            "mdi:radar"  # TODO will need to be replaced with brand logo or similar
-        )
-
-    @property
-    def unique_id(self) -> str:
-        """Return a unique ID."""
         # TODO do we need to prepend DOMAIN to make this unique or does HA do this already?
-        return self._device.mac
-
-    @property
-    def icon(self) -> str:
-        """Icon."""
-        # TODO theoretically HA should give the default device tracker icon
-        return self._icon
+        self._attr_unique_id = device.mac
+        self._last_written: tuple | None = None
 
     @property
     def name(self) -> str:
@@ -136,15 +135,23 @@ class GLinetDevice(ScannerEntity):
             data["default_name"] = self._device.name
         return data
 
-    @property
-    def should_poll(self) -> bool:
-        """No polling needed."""
-        return False
-
     @callback
     def async_on_demand_update(self) -> None:
-        """Update state."""
-        self._device = self._router.devices[self._device.mac]
+        """Update state.
+
+        The router updates the ClientDevInfo held here in place,
+        so there is nothing to look up. Devices that have not changed
+        since the last poll, typically those away, are not written again.
+        """
+        written = (
+            self._device.is_connected,
+            self._device.ip_address,
+            self._device.name,
+            self._device.last_activity,
+        )
+        if written == self._last_written:
+            return
+        self._last_written = written
         self.async_write_ha_state()
 
     async def async_added_to_hass(self) -> None:
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
 from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from functools import cached_property
 import logging
 
 from gli4py import GLinet
@@ -17,12 +19,21 @@ from homeassistant.components.device_tracker import (
     DOMAIN as TRACKER_DOMAIN,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_API_TOKEN, CONF_HOST, CONF_PASSWORD, CONF_USERNAME
-from homeassistant.core import HomeAssistant  # callback,CALLBACK_TYPE
+from homeassistant.const import (
+    CONF_API_TOKEN,
+    CONF_HOST,
+    CONF_MAC,
+    CONF_MODEL,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+)
+from homeassistant.core import HomeAssistant, callback  # CALLBACK_TYPE
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
 from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC
 from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_registry import RegistryEntry
 from homeassistant.helpers.event import async_track_time_interval
 
@@ -39,6 +50,9 @@ from .const import API_PATH, DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
 SCAN_INTERVAL = timedelta(seconds=30)
+CONFIG_SCAN_INTERVAL = timedelta(minutes=5)
+# Seconds to wait after a VPN command before checking its state
+VPN_REFRESH_COOLDOWN = 5
 
 
 class GLinetRouter:
@@ -67,9 +81,9 @@ class GLinetRouter:
         # self._api: GLinet
         self._host: str = entry.data[CONF_HOST]
 
-        # Stable properties
-        self._factory_mac: str = "UNKNOWN"
-        self._model: str = "UNKNOWN"
+        # Stable properties, persisted in the entry data once known
+        self._factory_mac: str = entry.data.get(CONF_MAC, "UNKNOWN")
+        self._model: str = entry.data.get(CONF_MODEL, "UNKNOWN")
         self._sw_v: str = "UNKNOWN"
 
         # State
@@ -78,12 +92,24 @@ class GLinetRouter:
         self._wireguard_clients: dict[str, WireGuardClient] = {}
         self._wireguard_connection: WireGuardClient | None = None
         self._tailscale_config: dict = {}
+        self._tailscale_missing: bool = False
         self._tailscale_connection: bool | None = None
 
         # Flow control
         self._late_init_complete: bool = False
         self._connect_error: bool = False
         self._token_error: bool = False
+        self._first_refresh_done: asyncio.Event = asyncio.Event()
+        self._update_lock: asyncio.Lock = asyncio.Lock()
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._renew_task: asyncio.Task | None = None
+        self._wireguard_refresher: Debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=VPN_REFRESH_COOLDOWN,
+            immediate=False,
+            function=self._async_refresh_wireguard_state,
+        )
 
     async def async_init(self) -> None:
         """Set up a GL-inet router.
@@ -92,10 +118,9 @@ class GLinetRouter:
         """
 
         try:
+            # Reuses the session token saved in the entry, if it has expired
+            # the first refused call will trigger a renewal
             self._api: GLinet = await self.get_api()
-            await self._api.login(
-                self._entry.data[CONF_USERNAME], self._entry.data[CONF_PASSWORD]
-            )
         except OSError as exc:
             _LOGGER.error(
                 "Error connecting to GL-inet router %s for setup: %s",
@@ -103,10 +128,25 @@ class GLinetRouter:
                 exc,
             )
             raise ConfigEntryNotReady from exc
+
+        if CONF_MAC in self._entry.data and CONF_MODEL in self._entry.data:
+            # The mac and model never change, only the firmware version can,
+            # so don't hold up setup waiting on router_info
+            self._entry.async_create_background_task(
+                self.hass,
+                self._async_refresh_router_info(),
+                f"{DOMAIN} {self._host} router info",
+            )
+            self._late_init_complete = True
+            return
+
         try:
             router_info = await self._update_platform(
                 self._api.router_info
             )  # TODO seems to always throw unexpected err on first boot
+            if router_info is None and self._token_error:
+                # The saved token was refused, retrying renews it first
+                router_info = await self._update_platform(self._api.router_info)
             _LOGGER.debug("Router info retrieved: %s", router_info)
             self._model = router_info["model"]
             self._sw_v = router_info["firmware_version"]
@@ -123,10 +163,31 @@ class GLinetRouter:
             )
             raise ConfigEntryNotReady from exc  # TODO probably shouldnt raise this after logging an error
 
+        # Entries created before the identity was stored in the data are migrated here
+        self.hass.config_entries.async_update_entry(
+            self._entry,
+            data={
+                **self._entry.data,
+                CONF_MAC: self._factory_mac,
+                CONF_MODEL: self._model,
+            },
+        )
         self._late_init_complete = True
 
+    async def _async_refresh_router_info(self) -> None:
+        """Fetch the firmware version and update the device registry with it."""
+        router_info = await self._update_platform(self._api.router_info)
+        if not router_info:
+            return
+        self._sw_v = router_info["firmware_version"]
+        self.add_to_device_registry()
+
     async def setup(self) -> None:
-        """Load in old and new entities and establish a new session token."""
+        """Load in saved entities and register the router device.
+
+        The first polls are made separately by async_config_first_refresh()
+        and async_first_refresh().
+        """
 
         if not self._late_init_complete:
             await self.async_init()
@@ -148,17 +209,53 @@ class GLinetRouter:
 
         # TODO, should we load in the switch entities
 
-        # Each new setup should renew the token
-        await self.renew_token()
+        self.add_to_device_registry()
+
+        self._entry.async_on_unload(self._wireguard_refresher.async_shutdown)
+        # State is polled often, configuration that rarely changes much less so
+        self._entry.async_on_unload(
+            async_track_time_interval(self.hass, self.update_all, SCAN_INTERVAL)
+        )
+        self._entry.async_on_unload(
+            async_track_time_interval(
+                self.hass, self.update_configs, CONFIG_SCAN_INTERVAL
+            )
+        )
 
-        await self.update_all()
+    async def async_config_first_refresh(self) -> None:
+        """Make the first configuration update, which the platforms are built from.
 
-        self.add_to_device_registry()
+        Setup may not have made any other call to the router, so this is where
+        an unreachable router or a password that no longer works fails setup.
+        """
+        await self.update_configs()
+        if self._token_error:
+            # The token saved in the entry was refused, the retry renews it
+            await self.update_configs()
+        if self._token_error:
+            raise ConfigEntryAuthFailed(
+                f"GL-inet router {self._host} refused a new token"
+            )
+        if self._connect_error:
+            raise ConfigEntryNotReady(
+                f"Error connecting to GL-inet router {self._host} for setup"
+            )
+
+    async def async_first_refresh(self) -> None:
+        """Make the first state update, platforms can wait for it to finish."""
+        try:
+            await self.update_all()
+        except Exception as exc:  # pylint: disable=broad-except  # noqa: BLE001
+            # The scheduled updates will try again
+            _LOGGER.error(
+                "First update of GL-inet router %s failed: %s", self._host, exc
+            )
+        finally:
+            self._first_refresh_done.set()
 
-        # TODO here we ask this to update all on the same scan interval
-        # but in future some sensors e.g WANip need to update less regularly than
-        # others
-        async_track_time_interval(self.hass, self.update_all, SCAN_INTERVAL)
+    async def async_wait_first_refresh(self) -> None:
+        """Wait until the first update has been made."""
+        await self._first_refresh_done.wait()
 
     async def get_api(self) -> GLinet:
         """Optimistically returns a GLinet object for connection to the API, no test included."""
@@ -171,7 +268,7 @@ class GLinetRouter:
             )
         if CONF_PASSWORD in conf:
             router = GLinet(sync=False, base_url=conf[CONF_HOST] + API_PATH)
-            await router.login(CONF_USERNAME, conf[CONF_PASSWORD])
+            await router.login(conf[CONF_USERNAME], conf[CONF_PASSWORD])
             return router
         _LOGGER.error(
             "Error setting up GL-inet router, no auth details found in configuration"
@@ -184,10 +281,12 @@ class GLinetRouter:
             await self._api.login(
                 self._entry.data[CONF_USERNAME], self._entry.data[CONF_PASSWORD]
             )
-            new_data = dict(self._entry.data)
-            new_data[CONF_API_TOKEN] = self._api.sid
-            # Update the configuration entry with the new data
-            self.hass.config_entries.async_update_entry(self._entry, data=new_data)
+            # Only persist the token if it changed, saving a write to storage
+            if self._entry.data.get(CONF_API_TOKEN) != self._api.sid:
+                self.hass.config_entries.async_update_entry(
+                    self._entry,
+                    data={**self._entry.data, CONF_API_TOKEN: self._api.sid},
+                )
             _LOGGER.info(
                 "GL-inet router %s token was renewed",
                 self._host,
@@ -200,13 +299,72 @@ class GLinetRouter:
             )
             raise ConfigEntryAuthFailed from exc
 
+    async def _async_renew_token_once(self) -> None:
+        """Renew the token, sharing a single login between concurrent callers."""
+        if self._renew_task is None or self._renew_task.done():
+            self._renew_task = self.hass.async_create_task(
+                self.renew_token(), eager_start=False
+            )
+        await asyncio.shield(self._renew_task)
+
     async def update_all(self, now: datetime | None = None) -> None:
-        """Update all Gl-inet platforms."""
-        await self.update_device_trackers()
-        await self.update_wireguard_client_state()
-        await self.update_tailscale_state()
+        """Update all Gl-inet platforms.
+
+        A slow router can still be answering the previous poll when the
+        next one is due, in which case the new poll is skipped.
+        """
+        if self._update_lock.locked():
+            _LOGGER.debug(
+                "Previous update of GL-inet router %s still running, skipping",
+                self._host,
+            )
+            return
+        async with self._update_lock:
+            # The endpoints are independent, so wait on them together
+            results = await asyncio.gather(
+                self.update_device_trackers(),
+                self.update_wireguard_client_state(),
+                self.update_tailscale_state(),
+                return_exceptions=True,
+            )
+        for result in results:
+            if isinstance(result, Exception):
+                _LOGGER.error(
+                    "Error updating GL-inet router %s: %s", self._host, result
+                )
+        # Whatever did update is still pushed to the entities
+        async_dispatcher_send(self.hass, self.signal_state_update)
+
+    async def update_configs(self, now: datetime | None = None) -> None:
+        """Update the router configuration, which rarely changes."""
+        await asyncio.gather(
+            self.update_wireguard_client_list(),
+            self.update_tailscale_config(),
+            # Retried until the firmware version has been fetched once
+            *(
+                (self._async_refresh_router_info(),)
+                if self._sw_v == "UNKNOWN"
+                else ()
+            ),
+        )
 
     async def _update_platform(self, api_callable: Callable):
+        """Make an update request to the api, or join an identical one in flight.
+
+        Callers racing on the same endpoint, e.g. a poll and a switch
+        refreshing its state, share a single request and its response.
+        """
+        key: str = api_callable.__name__
+        if (task := self._inflight.get(key)) is None:
+            task = self.hass.async_create_task(
+                self._async_call_api(api_callable), eager_start=False
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Don't let one caller being cancelled cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def _async_call_api(self, api_callable: Callable):
         """Boilerplate to make update requests to api and handle errors."""
 
         _LOGGER.debug("Checking client can connect to GL-inet router %s", self._host)
@@ -215,9 +373,9 @@ class GLinetRouter:
                 _LOGGER.debug(
                     "The last requested resulted in a token error - so renewing token"
                 )
-                await self.renew_token()
+                await self._async_renew_token_once()
             _LOGGER.debug(
-                "Making api call %s from _update_platform()", api_callable.__name__
+                "Making api call %s from _async_call_api()", api_callable.__name__
             )
             response = await api_callable()
         except TimeoutError as exc:
@@ -263,8 +421,8 @@ class GLinetRouter:
                 "Empty response from %s to request %s is of type %s, Response: %s",
                 self._host,
                 api_callable.__name__,
-                str(type(response)),
-                str(response),
+                type(response),
+                response,
             )
 
         if self._token_error:
@@ -278,21 +436,21 @@ class GLinetRouter:
             self._connect_error = False
             _LOGGER.info("Reconnected to Gl-inet router %s", self._host)
         _LOGGER.debug(
-            "_update_platform() completed without error for callable %s, returning response: %s",
+            "_async_call_api() completed without error for callable %s, returning response: %s",
             api_callable.__name__,
-            str(response),
+            response,
         )
         return response
 
     async def update_device_trackers(self) -> None:
         """Update the device trackers."""
 
-        new_device = False
+        new_devices: list[ClientDevInfo] = []
         wrt_devices = await self._update_platform(self._api.connected_clients)
         if not wrt_devices:
             _LOGGER.warning(
                 "Router returned no valid connected devices. It returned %s of type %s",
-                str(wrt_devices),
+                wrt_devices,
                 type(wrt_devices),
             )
             if wrt_devices == []:
@@ -303,37 +461,59 @@ class GLinetRouter:
         )
         # track_unknown = self._options.get(CONF_TRACK_UNKNOWN, DEFAULT_TRACK_UNKNOWN)
 
+        now: datetime = dt_util.utcnow()
         # TODO - ensure the output of gli4py devices has the correct data structure
         for device_mac, device in self._devices.items():
             dev_info = wrt_devices.get(device_mac)
-            device.update(dev_info, consider_home)
+            device.update(dev_info, consider_home, now)
 
-        for device_mac, dev_info in wrt_devices.items():
-            if device_mac in self._devices:
-                continue
+        # Only the macs the router reports that we don't know yet
+        for device_mac in wrt_devices.keys() - self._devices.keys():
+            dev_info = wrt_devices[device_mac]
             if not dev_info["name"]:
                 continue
-            new_device = True
             device = ClientDevInfo(device_mac)
-            device.update(dev_info)
+            device.update(dev_info, now=now)
             self._devices[device_mac] = device
+            new_devices.append(device)
 
         async_dispatcher_send(self.hass, self.signal_device_update)
-        if new_device:
-            async_dispatcher_send(self.hass, self.signal_device_new)
+        if new_devices:
+            # One signal for the whole batch so they are added together
+            async_dispatcher_send(self.hass, self.signal_device_new, new_devices)
 
         self._connected_devices = len(wrt_devices)
 
-    async def update_tailscale_state(self):
-        """Make a call to the API to get the tailscale state."""
-
-        if not await self._api.tailscale_configured():
+    async def update_tailscale_config(self) -> None:
+        """Make a call to the API to get the tailscale configuration."""
+        configured: bool | None = await self._update_platform(
+            self._api.tailscale_configured
+        )
+        if configured is None:
+            # Keep what we knew, the next config poll will try again
+            return
+        if not configured:
+            # gli4py also answers False when the request fails, so a known
+            # config is only dropped once a second poll agrees it has gone
+            if self._tailscale_config and not self._tailscale_missing:
+                self._tailscale_missing = True
+                return
             self._tailscale_config = {}
             return
+        self._tailscale_missing = False
         ##TODO this is a placeholder that needs to be replaced with a pulic method that combines usefull info in _tailscale_status and _tailscale_get_config
-        self._tailscale_config = await self._update_platform(
+        config: dict | bool | None = await self._update_platform(
             self._api._tailscale_get_config
         )
+        # gli4py answers False rather than raising when this request fails
+        if isinstance(config, dict):
+            self._tailscale_config = config
+
+    async def update_tailscale_state(self):
+        """Make a call to the API to get the tailscale state."""
+
+        if not self.tailscale_configured:
+            return
         response: TailscaleConnection = await self._update_platform(
             self._api.tailscale_connection_state
         )
@@ -343,16 +523,38 @@ class GLinetRouter:
         else:
             self._tailscale_connection = False
 
-    async def update_wireguard_client_state(self) -> None:
-        """Make call to the API to get the wireguard client state."""
+    async def async_request_wireguard_refresh(self) -> None:
+        """Request a refresh of the wireguard state after a command.
+
+        Bursts of requests, e.g. several switches toggled at once,
+        are answered by a single call once the cooldown has passed.
+        """
+        await self._wireguard_refresher.async_call()
+
+    async def _async_refresh_wireguard_state(self) -> None:
+        """Refresh the wireguard state and push it to the entities."""
+        await self.update_wireguard_client_state()
+        async_dispatcher_send(self.hass, self.signal_state_update)
+
+    async def update_wireguard_client_list(self) -> None:
+        """Make call to the API to get the configured wireguard clients."""
         # TODO as part of changes to switch.py, this probably needs to become
         # client/server/VPN type agnostic it may be that router/vpn/status
         # is a better API endpoint to do it in only 1 call
-        response: dict = await self._update_platform(self._api.wireguard_client_list)
+        response: list | None = await self._update_platform(
+            self._api.wireguard_client_list
+        )
+        if response is None:
+            return
         # TODO wireguard_client_list outputs some private info, we don't want it to end up in the logs.
         # TODO we need to do some validation before we start accessing dictionary keys, I've had errors before
         # May be best to redact it in gli4py.
         for config in response:
+            # Switches hold on to these objects, so update them in place
+            if (client := self._wireguard_clients.get(config["peer_id"])) is not None:
+                client.name = config["name"]
+                client.group_id = config["group_id"]
+                continue
             self._wireguard_clients[config["peer_id"]] = WireGuardClient(
                 name=config["name"],
                 connected=False,
@@ -360,23 +562,33 @@ class GLinetRouter:
                 peer_id=config["peer_id"],
             )
 
+    async def update_wireguard_client_state(self) -> None:
+        """Make call to the API to get the wireguard client state."""
         if len(self._wireguard_clients) == 0:
             _LOGGER.debug("No wireguard clients, there is nothing to update")
             return
 
         # update wether the currently selected WG client is connected
-        response: dict = await self._update_platform(self._api.wireguard_client_state)
+        response: dict | None = await self._update_platform(
+            self._api.wireguard_client_state
+        )
+        if not response:
+            return
         connected: bool = response["status"] == 1
 
-        # TODO in some circumstances this returns TypeError: 'NoneType' object is not subscriptable
-        if self._wireguard_clients[response["peer_id"]]:
-            client: WireGuardClient = self._wireguard_clients[response["peer_id"]]
+        # Only the selected client can be connected
+        for client in self._wireguard_clients.values():
+            client.connected = False
+        self._wireguard_connection = None
+        client: WireGuardClient | None = self._wireguard_clients.get(
+            response["peer_id"]
+        )
+        if client is not None:
             client.connected = connected
             if connected:
                 self._wireguard_connection = client
-                return
-        self._wireguard_connection = None
 
+    @callback
     def update_options(self, new_options: dict) -> bool:
         """Update router options.
 
@@ -389,6 +601,7 @@ class GLinetRouter:
         self._options.update(new_options)
         return req_reload
 
+    @callback
     def add_to_device_registry(self):
         """Asynchronysly adds to the registry.
 
@@ -397,6 +610,10 @@ class GLinetRouter:
         the device registry.
         """
         device_registry = dr.async_get(self.hass)
+        # Don't overwrite the stored firmware version before it is fetched
+        sw_version: dict[str, str] = (
+            {} if self._sw_v == "UNKNOWN" else {"sw_version": self._sw_v}
+        )
 
         device_registry.async_get_or_create(
             config_entry_id=self._entry.entry_id,
@@ -404,35 +621,39 @@ class GLinetRouter:
             # Huwawei LTE does this
             # https://github.com/home-assistant/core/blob/8d21e2b168c995346c8c6af7fe077ca0e97e6ab3/homeassistant/components/huawei_lte/__init__.py#L181
             # https://github.com/home-assistant/core/blob/8d21e2b168c995346c8c6af7fe077ca0e97e6ab3/homeassistant/components/huawei_lte/__init__.py#L404
-            connections={(CONNECTION_NETWORK_MAC, self.factory_mac)},
-            identifiers={(DOMAIN, self.factory_mac)},
-            manufacturer="GL-inet",
-            name=self.name,
-            model=self.model,
-            sw_version=self._sw_v,
+            **self.device_info,
+            **sw_version,
         )
 
-    # @property
-    # def device_info(self) -> DeviceInfo:
-    #     """Return the device information."""
-    #     data: DeviceInfo = {
-    #       "connections": {(CONNECTION_NETWORK_MAC, self.factory_mac)},
-    #       "identifiers": {(DOMAIN, self.factory_mac)},
-    #       "name": self.name,
-    #       "model": self.model,
-    #       "manufacturer": "GL-inet",
-    #     }
-    #     return data
+    @cached_property
+    def device_info(self) -> DeviceInfo:
+        """Return the device information, shared by all router entities.
+
+        Only valid once async_init() has retrieved the factory mac.
+        """
+        data: DeviceInfo = {
+            "connections": {(CONNECTION_NETWORK_MAC, self.factory_mac)},
+            "identifiers": {(DOMAIN, self.factory_mac)},
+            "name": self.name,
+            "model": self.model,
+            "manufacturer": "GL-inet",
+        }
+        return data
 
     @property
     def signal_device_new(self) -> str:
         """Event specific per GL-inet entry to signal new device."""
-        return f"{DOMAIN}-device-new"
+        return f"{DOMAIN}-{self._entry.entry_id}-device-new"
 
     @property
     def signal_device_update(self) -> str:
         """Event specific per GL-inet entry to signal updates in devices."""
-        return f"{DOMAIN}-device-update"
+        return f"{DOMAIN}-{self._entry.entry_id}-device-update"
+
+    @property
+    def signal_state_update(self) -> str:
+        """Event specific per GL-inet entry to signal a completed poll."""
+        return f"{DOMAIN}-{self._entry.entry_id}-state-update"
 
     @property
     def host(self) -> str:
@@ -449,21 +670,21 @@ class GLinetRouter:
         """Return router API."""
         return self._api
 
-    @property
+    @cached_property
     def factory_mac(self) -> str:
-        """Return router factory_mac."""
+        """Return router factory_mac, fixed once async_init() has run."""
         return self._factory_mac
 
-    @property
+    @cached_property
     def model(self) -> str:
-        """Return router model."""
+        """Return router model, fixed once async_init() has run."""
         return self._model.upper()
 
-    @property
+    @cached_property
     def name(self) -> str:
-        """Return router name."""
+        """Return router name, fixed once async_init() has run."""
         # TODO retrieve the friendly name of the router e.g MT1300 is Beryl
-        return f"GL-inet {self._model.upper()}"
+        return f"GL-inet {self.model}"
 
     @property
     def wireguard_clients(self) -> dict[str, WireGuardClient]:
@@ -501,7 +722,7 @@ class GLinetRouter:
         return self._tailscale_config
 
 
-@dataclass
+@dataclass(slots=True)
 class WireGuardClient:
     """Class for keeping track of WireGuard Client Configs."""
 
@@ -514,6 +735,8 @@ class WireGuardClient:
 class ClientDevInfo:
     """Representation of a device connected to the router."""
 
+    __slots__ = ("_mac", "_name", "_ip_address", "_last_activity", "_connected")
+
     def __init__(self, mac: str, name=None) -> None:
         """Initialize a connected device."""
         self._mac: str = mac
@@ -522,9 +745,18 @@ class ClientDevInfo:
         self._last_activity: datetime = dt_util.utcnow() - timedelta(days=1)
         self._connected: bool = False
 
-    def update(self, dev_info: dict | None = None, consider_home=0):
-        """Update connected device info."""
-        now: datetime = dt_util.utcnow()
+    def update(
+        self,
+        dev_info: dict | None = None,
+        consider_home=0,
+        now: datetime | None = None,
+    ):
+        """Update connected device info.
+
+        now can be passed in so a poll uses one timestamp for all devices.
+        """
+        if now is None:
+            now = dt_util.utcnow()
         if dev_info:
             if not self._name:
                 # GLinet router name unknown devices "*"
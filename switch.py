@@ -2,18 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EntityCategory
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC
-from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DATA_GLINET, DOMAIN
 from .router import GLinetRouter, WireGuardClient
 
 _LOGGER = logging.getLogger(__name__)
@@ -23,96 +22,113 @@ async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up the Pi-hole switch."""
-    router: GLinetRouter = hass.data[DOMAIN][entry.entry_id][DATA_GLINET]
-    switches: list[WireGuardSwitch | TailscaleSwitch] = []
-    if router.wireguard_clients:
-        # TODO detect all configured wireguard, openvpn, shadowsocks and
-        # TOR clients & servers with router/vpn/status? and gen a switch for each
-        switches = [
+    router: GLinetRouter = entry.runtime_data
+    # The configuration is already known, the first poll gives the switch states
+    await router.async_wait_first_refresh()
+    # TODO detect all configured wireguard, openvpn, shadowsocks and
+    # TOR clients & servers with router/vpn/status? and gen a switch for each
+    switches: list[GLinetSwitchBase] = [
+        *(
             WireGuardSwitch(router, client)
             for client in router.wireguard_clients.values()
-        ]
-    if router.tailscale_configured:
-        switches.append(TailscaleSwitch(router))
+        ),
+        *((TailscaleSwitch(router),) if router.tailscale_configured else ()),
+    ]
     if switches:
-        async_add_entities(switches, True)
+        async_add_entities(switches)
 
 
-class TailscaleSwitch(SwitchEntity):
-    """A tailscale switch."""
+class GLinetSwitchBase(SwitchEntity):
+    """A switch whose state is pushed by the router's polls."""
+
+    _attr_icon = "mdi:vpn"  # TODO would be better to have MDI style icons for each of the VPN types
+    _attr_entity_category = EntityCategory.CONFIG
+    _attr_should_poll = False
 
     def __init__(self, router: GLinetRouter) -> None:
-        """Initialize a GLinet device."""
+        """Initialize a GLinet switch."""
         self._router = router
-        # self._client = client
-
-    _attr_icon = "mdi:vpn"  # TODO would be better to have MDI style icons for each of the VPN types
+        self._attr_device_info = router.device_info
+        # Serializes commands so rapid toggles reach the router in order
+        self._command_lock: asyncio.Lock = asyncio.Lock()
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Refresh cached attributes from the router, if the switch has any."""
+
+    @callback
+    def async_on_demand_update(self) -> None:
+        """Update state, only writing it if the router reports a change.
+
+        A toggle has already written its optimistic state, so the
+        confirming refresh usually has nothing new to write.
+        """
+        was_on = self._attr_is_on
+        self._async_update_attrs()
+        if self._attr_is_on == was_on:
+            return
+        self.async_write_ha_state()
+
+    async def async_added_to_hass(self) -> None:
+        """Register state update callback."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                self._router.signal_state_update,
+                self.async_on_demand_update,
+            )
+        )
+
+
+class TailscaleSwitch(GLinetSwitchBase):
+    """A tailscale switch."""
 
-    @property
-    def name(self) -> str:
-        """Return the name of the switch."""
-        # TODO we could add the login_name here, but we lose access to that value when the connection drops
-        return "Tailscale"
+    # TODO we could add the login_name here, but we lose access to that value when the connection drops
+    _attr_name = "Tailscale"
 
-    @property
-    def unique_id(self) -> str:
-        """Return the unique id of the switch."""
-        return f"glinet_switch/{self._router.factory_mac}/tailscale"
+    def __init__(self, router: GLinetRouter) -> None:
+        """Initialize a GLinet device."""
+        super().__init__(router)
+        self._attr_unique_id = f"glinet_switch/{router.factory_mac}/tailscale"
+        self._attr_entity_registry_enabled_default = router.tailscale_configured
+        self._attr_entity_registry_visible_default = router.tailscale_configured
+        self._async_update_attrs()
 
-    @property
-    def is_on(self) -> bool:
-        """Return if the service is on."""
-        return self._router.tailscale_connection
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Refresh the tailscale connection state."""
+        self._attr_is_on = bool(self._router.tailscale_connection)
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the service."""
-        try:
-            await self._router.api.tailscale_start()
-            # TODO since the state takes a while to change we may
-            await self._router.update_tailscale_state()
-        except OSError:
-            _LOGGER.error("Unable to enable tailscale connection")
+        async with self._command_lock:
+            try:
+                await self._router.api.tailscale_start()
+            except OSError:
+                _LOGGER.error("Unable to enable tailscale connection")
+                return
+            # The connection takes a while to come up, the next poll confirms it
+            self._attr_is_on = True
+            self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the service."""
-        try:
-            await self._router.api.tailscale_stop()
-            await self._router.update_tailscale_state()
-        except OSError:
-            _LOGGER.error("Unable to stop tailscale connection")
+        async with self._command_lock:
+            try:
+                await self._router.api.tailscale_stop()
+            except OSError:
+                _LOGGER.error("Unable to stop tailscale connection")
+                return
+            self._attr_is_on = False
+            self.async_write_ha_state()
 
     @property
     def lan_access(self) -> bool:
         """Whether the router exposes the LAN as a subnet."""
         return self._router.tailscale_config["lan_enabled"]
 
-    @property
-    def entity_category(self) -> EntityCategory:
-        """A config entity."""
-        return EntityCategory.CONFIG
-
-    @property
-    def entity_registry_enabled_default(self) -> bool:
-        """Enabled by default."""
-        return self._router.tailscale_configured
-
-    @property
-    def entity_registry_visible_default(self) -> bool:
-        """Enabled by default."""
-        return self._router.tailscale_configured
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return the device information."""
-        # TODO this should probably be defined in the router device not here in the switch
-        data: DeviceInfo = {
-            "connections": {(CONNECTION_NETWORK_MAC, self._router.factory_mac)},
-            "identifiers": {(DOMAIN, self._router.factory_mac)},
-        }
-        return data
 
-
-class WireGuardSwitch(SwitchEntity):
+class WireGuardSwitch(GLinetSwitchBase):
     """Representation of a VPN switch."""
 
     # TODO make class, client/server/VPN type agnostic and appreciate >1 can be configured of each
@@ -121,59 +137,48 @@ class WireGuardSwitch(SwitchEntity):
     # multiples of any one type etc etc
     def __init__(self, router: GLinetRouter, client: WireGuardClient) -> None:
         """Initialize a GLinet device."""
-        self._router = router
+        super().__init__(router)
         self._client = client
-
-    _attr_icon = "mdi:vpn"  # TODO would be better to have MDI style icons for each of the VPN types
-
-    @property
-    def name(self) -> str:
-        """Return the name of the switch."""
-        return f"WG Client {self._client.name}"
-
-    @property
-    def unique_id(self) -> str:
-        """Return the unique id of the switch."""
-        return f"glinet_switch/{self._router.factory_mac}/{self._client.name}/wireguard_client"
-
-    @property
-    def is_on(self) -> bool:
-        """Return if the service is on."""
+        self._attr_name = f"WG Client {client.name}"
+        self._attr_unique_id = (
+            f"glinet_switch/{router.factory_mac}/{client.name}/wireguard_client"
+        )
+        self._async_update_attrs()
+
+    @callback
+    def _async_update_attrs(self) -> None:
+        """Refresh whether this client is the connected one."""
         # TODO alter property to account for the fact that users can have
         # > 1 client configured, but only one connected
-        return self._router.wireguard_connection == self._client
+        self._attr_is_on = self._router.wireguard_connection is self._client
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the service."""
-        try:
-            if self._router.connected_wireguard_client not in [self._client, None]:
-                await self._router.api.wireguard_client_stop()
-                # TODO may need to introduce a delay here, or await confirmation of the stop
-            await self._router.api.wireguard_client_start(
-                self._client.group_id, self._client.peer_id
-            )  # TODO not working
-        except OSError:
-            _LOGGER.error("Unable to enable WG client")
+        async with self._command_lock:
+            try:
+                if self._router.connected_wireguard_client not in [self._client, None]:
+                    await self._router.api.wireguard_client_stop()
+                    # TODO may need to introduce a delay here, or await confirmation of the stop
+                await self._router.api.wireguard_client_start(
+                    self._client.group_id, self._client.peer_id
+                )  # TODO not working
+            except OSError:
+                _LOGGER.error("Unable to enable WG client")
+                return
+            # The router's refresh confirms the connection
+            self._attr_is_on = True
+            self.async_write_ha_state()
+            await self._router.async_request_wireguard_refresh()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off the service."""
-        try:
-            await self._router.api.wireguard_client_stop()
-            # TODO may need to introduce a delay here, or await confirmation of the stop
-        except OSError:
-            _LOGGER.error("Unable to stop WG client")
-
-    @property
-    def entity_category(self) -> EntityCategory:
-        """A config entity."""
-        return EntityCategory.CONFIG
-
-    @property
-    def device_info(self) -> DeviceInfo:
-        """Return the device information."""
-        # TODO this should probably be defined in the router device not here in the switch
-        data: DeviceInfo = {
-            "connections": {(CONNECTION_NETWORK_MAC, self._router.factory_mac)},
-            "identifiers": {(DOMAIN, self._router.factory_mac)},
-        }
-        return data
+        async with self._command_lock:
+            try:
+                await self._router.api.wireguard_client_stop()
+                # TODO may need to introduce a delay here, or await confirmation of the stop
+            except OSError:
+                _LOGGER.error("Unable to stop WG client")
+                return
+            self._attr_is_on = False
+            self.async_write_ha_state()
+            await self._router.async_request_wireguard_refresh()